@@ -20,11 +20,14 @@
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 #pylint: disable=C0111
+# the game is a single runnable file on purpose, so it may be long
+#pylint: disable=C0302
 
 import random
 from datetime import datetime
 import time
 import os
+import sys
 
 VERSION = "0.8b"
 
@@ -34,13 +37,32 @@ def cls():
     # os.system('cls' if os.name == 'nt' else 'clear')
 
 
-class BoardException(BaseException):
+def bit_indices(mask: int) -> list:
+    """Get indexes of set bits, lowest first
+    """
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
 
-    def __init__(self, *args: object) -> None:  # pylint: disable=super-init-not-called
-        if args:
-            self.msg = args[0]
-        else:
-            self.msg = None
+
+class BoardException(Exception):
+
+    @property
+    def msg(self) -> str:
+        """Exception details, formatted only when asked for
+
+        Cell is passed as (row, col) and shown by its name
+        """
+        if not self.args:
+            return None
+
+        detail = self.args[0]
+        if isinstance(detail, tuple) and detail in CELL_NAMES:
+            return CELL_NAMES[detail]
+        return str(detail)
 
 
 class BoardOutException(BoardException):
@@ -81,30 +103,10 @@ class BadBoardException(BoardException):
 
 class CellState:
 
-    FREE = " "
-    #MISS = "-"
-    MISS = "·"
-    SHIP = "█"
-    WRECK = "░"
-
-
-class Cell:
-
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-
-    def __eq__(self, other):
-        return self.row == other.row and self.col == other.col
-
-    def __str__(self) -> str:
-        return f"{Board.V_LABELS[self.row]}{Board.H_LABELS[self.col]}"
-
-    def __repr__(self):
-        return f"Cell({Board.V_LABELS[self.row]}, {Board.H_LABELS[self.col]})"
-
-    def __hash__(self) -> int:
-        return self.row * 100 + self.col
+    FREE = 0
+    MISS = 1
+    SHIP = 2
+    WRECK = 3
 
 
 class ShipState:
@@ -116,83 +118,119 @@ class ShipState:
 
 class Ship:
 
-    def __init__(self):
-        self.cells = set()
+    __slots__ = ("cells", "_remaining")
 
-    def add_cell(self, cell: Cell):
-        """Add cell to ship
+    def __init__(self, cells=()):
+        # cells never change once the ship is built, hits only count down
+        self.cells = frozenset(cells)
+        self._remaining = len(self.cells)
+
+    def hit(self, target: tuple) -> ShipState:
+        """Check hitting ship
+
+        Every cell must be hit only once, Board takes care of it
+        by dropping the cell from its cell_to_ship index
 
         Args:
-            cell (Cell): Cell
+            target (tuple): (row, col) to check
+
+        Returns:
+            ShipState: Hit state (sink, hit, miss)
         """
-        self.cells.add(cell)
+        if target not in self.cells:
+            return ShipState.MISS
+
+        self._remaining -= 1
+        return ShipState.HIT if self._remaining else ShipState.SINK
 
-    def is_hit(self, target: Cell) -> Cell:
-        """Search ships hit point
+    def __str__(self) -> str:
+        return f"SHIP: {self._remaining}/{len(self.cells)}, " + \
+            " ".join([Board.cell_name(item) for item in self.cells])
+
+
+class ShipFactory:
 
-        Return hit cell or None if miss
+    @staticmethod
+    def build_ship(ship_size: int, row: int, col: int, orientation: int) -> Ship:
+        """Ships factoty.
+
+        Build ship starting at the given cell
 
         Args:
-            target (Cell): Cell to check
+            ship_size (int): ship lenght in cells
+            row (int): top row of the ship
+            col (int): left column of the ship
+            orientation (int): 1 - vertical, 0 - horizontal
 
         Returns:
-            Cell: Cell or None
+            Ship: Ship object
         """
-        for cell in self.cells:
-            if cell == target:
-                return cell
-        return None
+        if orientation:
+            return Ship((row + i, col) for i in range(ship_size))
 
-    def hit(self, target: Cell) -> ShipState:
-        """Check hitting ship
+        return Ship((row, col + i) for i in range(ship_size))
+
+    # (ship_size, board_size) -> every placement on an empty board
+    _PLACEMENTS = {}
+
+    @staticmethod
+    def get_placements(ship_size: int, board_size: int) -> list:
+        """Get every placement of a ship on an empty board
+
+        List is built once for ship and board size
 
         Args:
-            target (Cell): Cell to check
+            ship_size (int): ship lenght in cells
+            board_size (int): board size in cells
 
         Returns:
-            ShipState: Hit state (sink, hit, miss)
+            list: (row, col, orientation, cells_mask) tuples, cells_mask
+                has bit row * board_size + col set for every ship cell
         """
-        hit_cell = self.is_hit(target)
-        if hit_cell:
-            self.cells.remove(hit_cell)
-            if self.cells:
-                return ShipState.HIT
-            else:
-                return ShipState.SINK
-        else:
-            return ShipState.MISS
+        placements = ShipFactory._PLACEMENTS.get((ship_size, board_size))
+        if placements is None:
+            line_mask = (1 << ship_size) - 1
+            column_mask = sum(1 << (i*board_size) for i in range(ship_size))
 
-    def __str__(self) -> str:
-        return f"SHIP: {len(self.cells)}, " + " ".join([str(item) for item in self.cells])
+            placements = []
+            for row in range(board_size):
+                for col in range(board_size - ship_size + 1):
+                    placements.append((row, col, 0, line_mask << (row*board_size + col)))
 
+            # one-cell ship looks the same in both orientations
+            if ship_size > 1:
+                for row in range(board_size - ship_size + 1):
+                    for col in range(board_size):
+                        placements.append((row, col, 1, column_mask << (row*board_size + col)))
 
-class ShipFactory:
+            ShipFactory._PLACEMENTS[(ship_size, board_size)] = placements
+        return placements
 
     @staticmethod
-    def build_ship(ship_size: int, board_size: int) -> Ship:
+    def build_ship_legal(ship_size: int, blocked: int, board_size: int,
+                         rng: random.Random = None) -> Ship:
         """Ships factoty.
 
-        Generate random ship
+        Generate random ship at one of the placements that fit
 
         Args:
             ship_size (int): ship lenght in cells
+            blocked (int): bit row * board_size + col is set for cells
+                taken by a ship or touching one
             board_size (int): board size in cells
+            rng (random.Random): random generator, module random by default
 
         Returns:
-            Ship: Ship object
+            Ship: Ship object or None if there is no room for the ship
         """
-        ship = Ship()
-
-        row = random.randint(0, board_size - ship_size)
-        col = random.randint(0, board_size - ship_size)
-        orientation = random.randint(0, 1)
-        for _ in range(ship_size):
-            ship.add_cell(Cell(row, col))
-            if orientation:
-                row += 1
-            else:
-                col += 1
-        return ship
+        placements = [placement for placement in ShipFactory.get_placements(ship_size, board_size)
+                      if not placement[3] & blocked]
+        if not placements:
+            return None
+
+        rng = rng or random
+        row, col, orientation, _ = rng.choice(placements)
+        return ShipFactory.build_ship(ship_size, row, col, orientation)
 
 
 # 1 - slyte as in B7.5 asked
@@ -203,11 +241,23 @@ class BoardViewStyle:
     MODERN_VIEW = 2
 
 
-class Board:
+class Board:  # pylint: disable=too-many-instance-attributes
+
+    __slots__ = ("size", "show_ships", "field", "ships", "cell_to_ship", "blocked",
+                 "_classic_header", "_modern_header", "_modern_sep",
+                 "_picture", "_picture_key")
 
     BOARD_STYLE = BoardViewStyle.MODERN_VIEW
     V_LABELS = list("ABCDEFGHIJ")
     H_LABELS = list("1234567890")
+    # label -> row or column
+    V_INDEX = {label: i for i, label in enumerate(V_LABELS)}
+    H_INDEX = {label: i for i, label in enumerate(H_LABELS)}
+
+    # cell glyphs indexed by CellState code (FREE, MISS, SHIP, WRECK),
+    # glyphs of one style must have the same width
+    CLASSIC_GLYPHS = (" О |", " T |", " ■ |", " X |")
+    MODERN_GLYPHS = ("  ", "()", "██", "░░")
 
     def __init__(self, size: int):
         if 0 < size <= 10:
@@ -217,52 +267,100 @@ class Board:
 
         self.show_ships = True
 
-        self.field = [[CellState.FREE]*self.size for _ in range(self.size)]
+        # flat row * size + col bytes, every byte is a CellState code
+        self.field = bytearray(self.size*self.size)
 
-        self.shots = set()
         self.ships = set()
+        # owning ship of every afloat ship cell
+        self.cell_to_ship = {}
+        # bit row * size + col is set for cells taken by a ship or touching one
+        self.blocked = 0
+
+        # static parts of the board picture
+        self._classic_header = "  | " + " | ".join(self.H_LABELS[:self.size]) + " |"
+        self._modern_header = "  | " + " ".join(self.H_LABELS[:self.size]) + "|"
+        self._modern_sep = "--|" + "-"*(self.size*2) + "|--"
+
+        # last drawn board and the state it was drawn from
+        self._picture = None
+        self._picture_key = None
 
     def __str__(self):
         """Draw board
         """
+        return "\n".join(self.render_rows())
+
+    def render_rows(self) -> tuple:
+        """Draw board as lines
+
+        Board is redrawn only if the field, visibility or style changed
+
+        Returns:
+            tuple: lines of the board picture
+        """
+        key = (bytes(self.field), self.visible, Board.BOARD_STYLE)
+        if key == self._picture_key:
+            return self._picture
+
         if Board.BOARD_STYLE == BoardViewStyle.CLASSIC_VIEW:
-            buffer = "  | " + " | ".join(self.H_LABELS[:self.size]) + " |"
-
-            for i, row in enumerate(self.field):
-                buffer += f"\n{self.V_LABELS[i]} |"
-                for cell in row:
-                    if cell == CellState.SHIP:
-                        buffer += " ■ |" if self.visible else " О |"
-                    elif cell == CellState.WRECK:
-                        buffer += " X |"
-                    elif cell == CellState.MISS:
-                        buffer += " T |"
-                    elif cell == CellState.FREE:
-                        buffer += " О |"
+            lines = [self._classic_header]
+            for label, row in zip(self.V_LABELS, self._field_rows(self.CLASSIC_GLYPHS)):
+                lines.append(f"{label} |{row}")
 
         elif Board.BOARD_STYLE == BoardViewStyle.MODERN_VIEW:
-            buffer = "  | " + " ".join(self.H_LABELS[:self.size]) + "|"
-            buffer += "\n--|" + "-"*(self.size*2) + "|--"
-            for i, row in enumerate(self.field):
-                buffer += f"\n{self.V_LABELS[i]} |"
-                for cell in row:
-                    if not self.visible and cell == CellState.SHIP:
-                        buffer += CellState.FREE*2
-                    elif cell == CellState.MISS:
-                        buffer += "()"
-                    else:
-                        buffer += cell*2
-                buffer += f"| {self.V_LABELS[i]}"
-            buffer += "\n--|" + "-"*(self.size*2) + "|--"
-            buffer += "\n  | " + " ".join(self.H_LABELS[:self.size]) + "|"
-
-        return buffer
-
-    def get_cell(self, cell: Cell) -> CellState:
+            lines = [self._modern_header, self._modern_sep]
+            for label, row in zip(self.V_LABELS, self._field_rows(self.MODERN_GLYPHS)):
+                lines.append(f"{label} |{row}| {label}")
+            lines.append(self._modern_sep)
+            lines.append(self._modern_header)
+
+        self._picture = tuple(lines)
+        self._picture_key = key
+        return self._picture
+
+    # (glyphs, visible) -> str.translate() table of CellState codes
+    _GLYPH_TABLES = {}
+
+    def _field_rows(self, glyphs: tuple) -> list:
+        """Draw field rows
+
+        Whole field is mapped to glyphs by one str.translate() call
+        and then cut into rows.
+
+        Args:
+            glyphs (tuple): glyph for every CellState code
+
+        Returns:
+            list: row strings
+        """
+        table = self._GLYPH_TABLES.get((glyphs, self.visible))
+        if table is None:
+            table = dict(enumerate(glyphs))
+            if not self.visible:
+                table[CellState.SHIP] = glyphs[CellState.FREE]
+            self._GLYPH_TABLES[(glyphs, self.visible)] = table
+
+        picture = self.field.decode("latin-1").translate(table)
+        width = len(glyphs[CellState.FREE])*self.size
+        return [picture[row*width:(row + 1)*width] for row in range(self.size)]
+
+    @staticmethod
+    def cell_name(cell: tuple) -> str:
+        """Get cell name as the player types it
+
+        Args:
+            cell (tuple): (row, col)
+
+        Returns:
+            str: Cell name (A1, C4, ...)
+        """
+        return CELL_NAMES[cell]
+
+    def get_cell(self, cell: tuple) -> CellState:
         """Get cell value
 
         Args:
-            cell (Cell): Cell
+            cell (tuple): (row, col)
 
         Raises:
             BoardOutException: Raise if out of board boundary
@@ -270,92 +368,91 @@ class Board:
         Returns:
             CellState: Cell status (free, ship, wreck, miss)
         """
-        if all([
-            0 <= cell.row < self.size,
-            0 <= cell.col < self.size
-        ]):
-            return self.field[cell.row][cell.col]
+        row, col = cell
+        if 0 <= row < self.size and 0 <= col < self.size:
+            return self.field[row*self.size + col]
 
-        raise BoardOutException(str(cell))
+        raise BoardOutException(cell)
 
-    def set_cell(self, cell: Cell, value: CellState):
+    def set_cell(self, cell: tuple, value: CellState):
         """Set cell value
 
         Args:
-            cell (Cell): Cell
+            cell (tuple): (row, col)
             value (CellState): Value
 
         Raises:
             BoardOutException: Raise if out of board boundary
         """
-        if all([
-            0 <= cell.row < self.size,
-            0 <= cell.col < self.size
-        ]):
-            self.field[cell.row][cell.col] = value
+        row, col = cell
+        if 0 <= row < self.size and 0 <= col < self.size:
+            self.field[row*self.size + col] = value
         else:
-            raise BoardOutException(str(cell))
-
-    AREA_FULL = [-1, 0, 1]
-    AREA_DIAG = [-1, 1]
+            raise BoardOutException(cell)
 
-    def get_nbhd(self, cell: Cell, area: list = AREA_FULL) -> set:  # pylint: disable=dangerous-default-value
-        """Get neighborhood cells
+    # (row, col) offsets of neighborhood cells
+    AREA_FULL = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+    AREA_V = ((-1, 0), (1, 0))
+    AREA_H = ((0, -1), (0, 1))
+    AREA_CROSS = AREA_V + AREA_H
 
-        Args:
-            cell (Cell): Cell
-            area (list): AREA_FULL = around, AREA_DIAG = diag
-
-        Returns:
-            list: Neighborhood cell list
-        """
-        nbhd = set()
-        for offset_row in area:
-            for offset_col in area:
-                if offset_row == 0 and offset_col == 0:
-                    continue
+    # (size, area) -> {cell: neighborhood bitmask}, shared by boards of one size
+    _NBHD_MASKS = {}
 
-                if all([
-                    0 <= (cell.row + offset_row) < self.size,
-                    0 <= (cell.col + offset_col) < self.size
-                ]):
-                    nbhd.add(Cell(cell.row + offset_row, cell.col + offset_col))
+    def get_nbhd_mask(self, cell: tuple, area: tuple = AREA_FULL) -> int:
+        """Get neighborhood cells as bitmask
 
-        # for cell in nbhd:
-        #    self.set_cell(cell, "+")
-        return nbhd
-
-    def get_nbhd_v(self, cell: Cell) -> set:
-        """Get neighborhood cells up/down
+        Masks are built on first use
 
         Args:
-            cell (Cell): Cell
+            cell (tuple): (row, col)
+            area (tuple): AREA_FULL = around, AREA_V = up/down,
+                AREA_H = left/right, AREA_CROSS = both
 
         Returns:
-            list: Neighborhood cell list
+            int: bit row * size + col is set for every neighborhood cell
         """
-        nbhd = set()
-        for offset in [-1, 1]:
-            if 0 <= (cell.row + offset) < self.size:
-                nbhd.add(Cell(cell.row + offset, cell.col))
-
-        return nbhd
-
-    def get_nbhd_h(self, cell: Cell) -> set:
-        """Get neighborhood cells left/right
+        size = self.size
+        masks = self._NBHD_MASKS.get((size, area))
+        if masks is None:
+            masks = {}
+            for row in range(size):
+                for col in range(size):
+                    masks[(row, col)] = sum(
+                        1 << ((row + offset_row)*size + col + offset_col)
+                        for offset_row, offset_col in area
+                        if 0 <= row + offset_row < size and 0 <= col + offset_col < size)
+            self._NBHD_MASKS[(size, area)] = masks
+        return masks[cell]
+
+    # size -> (first column mask, last column mask, whole board mask)
+    _EDGE_MASKS = {}
+
+    def dilate_mask(self, mask: int) -> int:
+        """Grow cells bitmask by one cell in all 8 directions
+
+        Cells are shifted as whole bit rows, edge columns are cut off
+        to keep them from wrapping to the next row
 
         Args:
-            cell (Cell): Cell
+            mask (int): bit row * size + col is set for every cell
 
         Returns:
-            list: Neighborhood cell list
+            int: mask with every AREA_FULL neighbor of its cells added
         """
-        nbhd = set()
-        for offset in [-1, 1]:
-            if 0 <= (cell.col + offset) < self.size:
-                nbhd.add(Cell(cell.row, cell.col + offset))
+        size = self.size
+        edges = self._EDGE_MASKS.get(size)
+        if edges is None:
+            first_col = sum(1 << (row*size) for row in range(size))
+            edges = (first_col, first_col << (size - 1), (1 << size*size) - 1)
+            self._EDGE_MASKS[size] = edges
+        first_col, last_col, board_mask = edges
+
+        grown = (mask | (mask << 1) & ~first_col | (mask >> 1) & ~last_col) & board_mask
+        return (grown | grown << size | grown >> size) & board_mask
 
-        return nbhd
+    # (size, ship cells mask) -> mask of the ship with its halo
+    _HALO_MASKS = {}
 
     def add_ship(self, ship: Ship):
         """Add ship to board
@@ -364,62 +461,81 @@ class Board:
             ship (Ship): Ship
 
         Raises:
-            BoardBadShipException: Raise if ship doesn't fit
+            BoardOutException: Raise if ship is out of board boundary
+            BoardShipPlacementException: Raise if ship doesn't fit
         """
-        for cell in ship.cells:
-            if self.get_cell(cell) != CellState.FREE:
-                raise BoardShipPlacementException
-            for nbhd_cell in self.get_nbhd(cell):
-                if self.get_cell(nbhd_cell) == CellState.SHIP:
-                    raise BoardShipPlacementException
+        size = self.size
+
+        ship_mask = 0
+        for row, col in ship.cells:
+            if not (0 <= row < size and 0 <= col < size):
+                raise BoardOutException((row, col))
+            ship_mask |= 1 << (row*size + col)
+        if ship_mask & self.blocked:
+            raise BoardShipPlacementException
 
         self.ships.add(ship)
 
+        field = self.field
+        cell_to_ship = self.cell_to_ship
         for cell in ship.cells:
-            self.set_cell(cell, CellState.SHIP)
+            field[cell[0]*size + cell[1]] = CellState.SHIP
+            cell_to_ship[cell] = ship
+
+        # ship with its halo, grown once for every placement
+        halo_mask = self._HALO_MASKS.get((size, ship_mask))
+        if halo_mask is None:
+            halo_mask = self.dilate_mask(ship_mask)
+            self._HALO_MASKS[(size, ship_mask)] = halo_mask
+
+        self.blocked |= halo_mask
 
-    def shot(self, hit_point: Cell) -> ShipState:
+    def shot(self, hit_point: tuple) -> ShipState:
         """Processing shot.
 
-        Check every ship on the board for a hit.
+        Look up the ship owning the cell, if any.
         Remove cell if hit or remove ship if sunk
 
         Args:
-            hit_point (Cell): Cell
+            hit_point (tuple): (row, col)
 
         Raises:
+            BoardOutException: Raise if out of board boundary
             BoardUsedException: Raise if this cell was used
 
         Returns:
             ShipState: Ship status (hit, sink, miss)
         """
-        if hit_point in self.shots:
-            raise BoardUsedException(str(hit_point))
-
-        self.shots.add(hit_point)
+        row, col = hit_point
+        size = self.size
+        if not (0 <= row < size and 0 <= col < size):
+            raise BoardOutException(hit_point)
 
-        # out of boundary check
-        self.get_cell(hit_point)
+        field = self.field
+        idx = row*size + col
 
-        for ship in self.ships:
-            hit_result = ship.hit(hit_point)
-            if hit_result == ShipState.HIT:
-                self.set_cell(hit_point, CellState.WRECK)
-                return hit_result
+        # the field itself remembers every shot as a miss or a wreck
+        if field[idx] in (CellState.MISS, CellState.WRECK):
+            raise BoardUsedException(hit_point)
 
-            if hit_result == ShipState.SINK:
-                self.ships.remove(ship)
-                self.set_cell(hit_point, CellState.WRECK)
-                return hit_result
+        ship = self.cell_to_ship.pop(hit_point, None)
+        if ship is None:
+            field[idx] = CellState.MISS
+            return ShipState.MISS
 
-        self.set_cell(hit_point, CellState.MISS)
-        return ShipState.MISS
+        hit_result = ship.hit(hit_point)
+        field[idx] = CellState.WRECK
+        if hit_result == ShipState.SINK:
+            self.ships.discard(ship)
+        return hit_result
 
     def clear(self):
         """Clear board
         """
         self.ships.clear()
-        self.field = [[CellState.FREE]*self.size for _ in range(self.size)]
+        self.cell_to_ship.clear()
+        self.field[:] = bytes(len(self.field))
+        self.blocked = 0
 
     @property
     def visible(self) -> bool:
@@ -430,14 +546,26 @@ class Board:
         self.show_ships = visible
 
 
+# (row, col) -> cell name as the player types it (A1, C4, ...)
+CELL_NAMES = {(row, col): v_label + h_label
+              for row, v_label in enumerate(Board.V_LABELS)
+              for col, h_label in enumerate(Board.H_LABELS)}
+
+
 class Player:
 
-    def __init__(self, board_size: int, name: str = None) -> None:
+    __slots__ = ("name", "board_size", "board", "move_list", "rng")
+
+    def __init__(self, board_size: int, name: str = None, rng: random.Random = None) -> None:
+        # own generator for every player, seeded from the module one
+        # unless given, so random.seed() still replays the whole game
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+
         if name:
             self.name = name
         else:
             self.name = type(self).__name__ + "-" + \
-                str(random.randint(1, 1000))
+                str(self.rng.randrange(1, 1001))
 
         self.board_size = board_size
         self.board = Board(board_size)
@@ -446,7 +574,7 @@ class Player:
     def __str__(self) -> str:
         return self.name
 
-    def _brain(self) -> Cell:
+    def _brain(self) -> tuple:
         """Main AI worker.
 
         Must be implemented for human or robot
@@ -455,17 +583,17 @@ class Player:
             NotImplementedError: Raise when not implemented
 
         Returns:
-            Cell: player's move
+            tuple: player's move (row, col)
         """
         raise NotImplementedError
 
-    def ask_move(self) -> Cell:
+    def ask_move(self) -> tuple:
         """Asking for move.
 
         Return player's move and store it in move_list
 
         Returns:
-            Cell: player's move
+            tuple: player's move (row, col)
         """
         cell = self._brain()
         self.move_list.append(cell)
@@ -487,16 +615,18 @@ class Player:
 
 class Human(Player):
 
-    def _brain(self) -> Cell:
+    __slots__ = ()
+
+    def _brain(self) -> tuple:
         """Read user input.
 
-        Check it and convert to Cell object
+        Check it and convert to (row, col)
 
         Raises:
             BoardOutException: Out of bounds exception
 
         Returns:
-            Cell: player's move
+            tuple: player's move (row, col)
         """
         cmd = input()
         if not cmd:
@@ -512,85 +642,85 @@ class Human(Player):
             row, col = list(cmd.upper())[:2]
 
         try:
-            return Cell(Board.V_LABELS.index(row), Board.H_LABELS.index(col))
-        except ValueError as error:
+            return (Board.V_INDEX[row], Board.H_INDEX[col])
+        except KeyError as error:
             raise BoardOutException from error
 
 
 class Robot(Player):
 
-    def __init__(self, board_size: int, name: str = None) -> None:
-        super().__init__(board_size, name)
+    __slots__ = ("enemy_board", "hits", "known", "tactic", "think_delay")
+
+    def __init__(self, board_size: int, name: str = None, rng: random.Random = None,
+                 think_delay: float = None) -> None:
+        super().__init__(board_size, name, rng)
+        # pause after every move in seconds, so a person can follow
+        # the game. No pause if nobody is at the terminal
+        if think_delay is None:
+            think_delay = 0.5 if sys.stdin is not None and sys.stdin.isatty() else 0.0
+        self.think_delay = think_delay
         self.enemy_board = Board(board_size)
         self.hits = []
+        # bit row * size + col is set for cells already shot
+        # or known to be empty
+        self.known = 0
+        # how the last move was chosen, "CHASE" or "RND"
+        self.tactic = None
 
-    def _chase(self) -> Cell:
+    def _chase(self) -> tuple:
         """Chase AI
 
         If there is wounded ship. Try to found other ship's cell
 
         Returns:
-            Cell: player's move
+            tuple: player's move (row, col)
         """
-        nbhd = set()
+        board = self.enemy_board
+        hits = self.hits
 
         # search around cells if hits is only 1 cell
-        if len(self.hits) == 1:
-            nbhd = self.enemy_board.get_nbhd_v(self.hits[0]).union(
-                self.enemy_board.get_nbhd_h(self.hits[0]))
+        if len(hits) == 1:
+            area = board.AREA_CROSS
 
         # else if hits more then 1 calc direction and seach
         else:
             # True if vertical, False if horizontal
-            is_vertical = self.hits[0].row - self.hits[1].row
-            for cell in self.hits:
-                nbhd = nbhd.union(self.enemy_board.get_nbhd_v(cell) if is_vertical
-                                  else self.enemy_board.get_nbhd_h(cell))
-
-        for cell in nbhd.copy():
-            # remove cell if already hits
-            if cell in self.move_list:
-                nbhd.remove(cell)
-                continue
-
-            # remove this cell if area of area hits cells contain wrecks of other ship
-            for cell_ in self.enemy_board.get_nbhd(cell):
-                if self.enemy_board.get_cell(cell_) == CellState.WRECK and (cell_ not in self.hits):
-                    nbhd.discard(cell_)
-                    break
+            is_vertical = hits[0][0] - hits[1][0]
+            area = board.AREA_V if is_vertical else board.AREA_H
+
+        nbhd = 0
+        for cell in hits:
+            nbhd |= board.get_nbhd_mask(cell, area)
 
-        print("CHASE: ", end="")
-        return random.choice(list(nbhd))
+        # drop cells already shot and cells touching wrecks of other ship
+        nbhd &= ~self.known
 
-    def _random_hit(self) -> Cell:
+        self.tactic = "CHASE"
+        return divmod(self.rng.choice(bit_indices(nbhd)), self.board_size)
+
+    def _random_hit(self) -> tuple:
         """Generate random move
 
         Returns:
-            Cell: player's move
+            tuple: player's move (row, col)
         """
         # random shot with some checks (do not be repeted and hit near wrecks)
-        while True:
-            row = random.randint(0, self.board_size - 1)
-            col = random.randint(0, self.board_size - 1)
-            target = Cell(row, col)
-
-            if target in self.move_list:
-                continue
-
-            # check neighborhood cells for wrecks
-            for cell in self.enemy_board.get_nbhd(target):
-                if self.enemy_board.get_cell(cell) == CellState.WRECK:
-                    target = None
-                    break
-
-            # break in acceptable shot
-            if target:
+        cells_count = self.board_size**2
+        free = ~self.known & ((1 << cells_count) - 1)
+
+        # while most cells are free a few blind draws are cheaper
+        # than listing free cells, odds stay even for each of them
+        for _ in range(4):
+            index = self.rng.randrange(cells_count)
+            if free >> index & 1:
                 break
+        else:
+            index = self.rng.choice(bit_indices(free))
 
-        print("RND: ", end="")
-        return target
+        self.tactic = "RND"
+        return divmod(index, self.board_size)
 
-    def _brain(self) -> Cell:
+    def _brain(self) -> tuple:
         # if has wounded ship
         if self.hits:
             target = self._chase()
@@ -598,25 +728,46 @@ class Robot(Player):
         else:
             target = self._random_hit()
 
-        time.sleep(0.5)
         return target
 
     def processing_answer(self, answer: ShipState):
-        super().processing_answer(answer)
+        """Processing last move result.
+
+        Set marks at own board and at enemy board copy
 
-        if answer == ShipState.HIT:
-            self.hits.append(self.move_list[-1])
-            self.enemy_board.set_cell(self.move_list[-1], CellState.WRECK)
-        elif answer == ShipState.SINK:
+        Args:
+            answer (ShipState): Hit, sink or miss
+        """
+        cell = self.move_list[-1]
+        size = self.board_size
+        # the move has passed enemy board checks, so it is on the board
+        idx = cell[0]*size + cell[1]
+        self.known |= 1 << idx
+
+        if answer == ShipState.MISS:
+            self.board.field[idx] = CellState.MISS
+            self.enemy_board.field[idx] = CellState.MISS
+            return
+
+        self.board.field[idx] = CellState.WRECK
+        self.enemy_board.field[idx] = CellState.WRECK
+        self.hits.append(cell)
+
+        if answer == ShipState.SINK:
+            # ships don't touch, so cells around the sunk ship are empty
+            sunk_area = 0
+            for hit in self.hits:
+                sunk_area |= self.enemy_board.get_nbhd_mask(hit)
+            enemy_field = self.enemy_board.field
+            for empty_idx in bit_indices(sunk_area & ~self.known):
+                enemy_field[empty_idx] = CellState.MISS
+            self.known |= sunk_area
             self.hits.clear()
-            self.enemy_board.set_cell(self.move_list[-1], CellState.WRECK)
-        else:
-            self.enemy_board.set_cell(self.move_list[-1], CellState.MISS)
 
 
 class Game:
 
-    def __init__(self, board_size: int, ship_set: list) -> None:
+    def __init__(self, board_size: int, ship_set: list, quiet: bool = False) -> None:
         if 0 < board_size <= 10:
             self.board_size = board_size
         else:
@@ -624,32 +775,28 @@ class Game:
 
         self.ship_set = ship_set
 
+        # no printing and no pauses while playing, for batch runs
+        self.quiet = quiet
+
         # opponents - list of players
         # player - {"brain": player, "board": board, "enemy": player)
 
         self.opponents = []
 
-    def place_ships(self, board: Board, ship_set: list):
-        # 100 attempt before raise exception
+    def place_ships(self, board: Board, ship_set: list, rng: random.Random = None):
+        # every ship goes to a random legal placement, but early ships
+        # may leave no room for the later ones. Then reset board and
+        # start from beggining, 100 attempts before raise exception
         for _ in range(100):
             for ship_size in ship_set:
-                # 1000 attempts to place ship
-                # otherwise reset board and start from beggining
-                for _ in range(1000):
-                    ship = ShipFactory.build_ship(ship_size, board.size)
-                    try:
-                        board.add_ship(ship)
-                        break
-                    except BoardShipPlacementException:
-                        ship = None
-
-                # after all tries
+                ship = ShipFactory.build_ship_legal(ship_size, board.blocked, board.size, rng)
                 if ship is None:
                     board.clear()
                     #print("Resetting board")
                     break
 
-            if len(board.ships) == len(SHIP_SET):
+                board.add_ship(ship)
+            else:
                 return
 
         raise BoardShipPlacementException
@@ -710,7 +857,7 @@ D | О | О | О | О | О | ■ |          C |  ██  ██    | C
         # assign enemy for each player
         try:
             for i, player in enumerate(self.opponents):
-                self.place_ships(player["board"], self.ship_set)
+                self.place_ships(player["board"], self.ship_set, player["brain"].rng)
                 player["enemy"] = self.opponents[(i + 1) % len(self.opponents)]
         except BadBoardException:
             return False
@@ -719,6 +866,18 @@ D | О | О | О | О | О | ■ |          C |  ██  ██    | C
                 f'\n\n  {self.opponents[0]["brain"].name} VS {self.opponents[1]["brain"].name}')
             return True
 
+    def _echo(self, *args, **kwargs):
+        """print() muted for quiet game
+        """
+        if not self.quiet:
+            print(*args, **kwargs)
+
+    def _pause(self, seconds: float):
+        """time.sleep() skipped for quiet game
+        """
+        if not self.quiet:
+            time.sleep(seconds)
+
     def _print_2_board(self, player1: Player, player2: Player):
         """Print two boards side by side
 
@@ -726,62 +885,66 @@ D | О | О | О | О | О | ■ |          C |  ██  ██    | C
             player1 (Player): player1
             player2 (Player): player2
         """
+        # don't even draw boards nobody will see
+        if self.quiet:
+            return
 
-        screen1 = []
-        screen1.append("  | " + player1["brain"].name)
-        screen1 += str(player1["board"]).split("\n")
+        screen1 = ["  | " + player1["brain"].name]
+        screen1 += player1["board"].render_rows()
 
-        screen2 = []
-        screen2.append("  | " + player2["brain"].name)
-        screen2 += str(player2["board"]).split("\n")
+        screen2 = ["  | " + player2["brain"].name]
+        screen2 += player2["board"].render_rows()
 
-        screen_width = len(max(screen1))
-        for l_1, l_2 in zip(screen1, screen2):
+        screen_width = max(len(line) for line in screen1)
+        self._echo("\n".join([f"{l_1:<{screen_width}}          {l_2:<{screen_width}}"
+                              for l_1, l_2 in zip(screen1, screen2)]))
 
-            print(f"{l_1:<{screen_width}}          {l_2:<{screen_width}}")
-
-    def start(self):
+    def start(self) -> Player:
+        """Game loop
 
+        Returns:
+            Player: winner or None if player has left the game
+        """
         turn = 1
         player_in_game = 0
 
-        print("\n\n")
+        self._echo("\n\n")
 
         while True:
             player = self.opponents[player_in_game]
 
             self._print_2_board(self.opponents[0], self.opponents[0]["enemy"])
 
-            print(f'\nMove # {turn}  {player["brain"]}')
-            print("Enter your move: ", end="")
+            self._echo(f'\nMove # {turn}  {player["brain"]}\nEnter your move: ', end="")
 
             try:
                 cell = player["brain"].ask_move()
-                if type(player["brain"]).__name__ == "Robot":
-                    print(str(cell))
+                if isinstance(player["brain"], Robot):
+                    self._echo(f'{player["brain"].tactic}: {Board.cell_name(cell)}')
+                    self._pause(player["brain"].think_delay)
 
                 if not cell:
-                    print(f'\nPlayer {player["brain"]} has left the game')
-                    return
+                    self._echo(f'\nPlayer {player["brain"]} has left the game')
+                    return None
 
                 answer = player["enemy"]["board"].shot(cell)
             except BoardOutException:
-                print("Out of board shot. Try again\n")
-                time.sleep(1)
+                self._echo("Out of board shot. Try again\n")
+                self._pause(1)
             except BoardUsedException:
-                print("You have already shot this target. Try again\n")
-                time.sleep(1)
+                self._echo("You have already shot this target. Try again\n")
+                self._pause(1)
             else:
                 # cls()
 
                 player["brain"].processing_answer(answer)
 
                 if answer == ShipState.HIT:
-                    print("\n >>>>>>> Hit! <<<<<<<\n")
+                    self._echo("\n >>>>>>> Hit! <<<<<<<\n")
                 elif answer == ShipState.SINK:
-                    print("\n >>>>>>> Sunk!!!! <<<<<<<\n")
+                    self._echo("\n >>>>>>> Sunk!!!! <<<<<<<\n")
                 else:
-                    print("\n >>>>>>> Miss <<<<<<<\n")
+                    self._echo("\n >>>>>>> Miss <<<<<<<\n")
                     player_in_game = 1 - player_in_game
 
                 if not player["enemy"]["board"].ships:
@@ -794,7 +957,8 @@ D | О | О | О | О | О | ■ |          C |  ██  ██    | C
         for player in self.opponents:
             player["board"].visible = True
         self._print_2_board(self.opponents[0], self.opponents[0]["enemy"])
-        print(f'\nPlayer {winner["brain"]} won!')
+        self._echo(f'\nPlayer {winner["brain"]} won!')
+        return winner["brain"]
 
 
 # Game
@@ -838,6 +1002,8 @@ D | О | О | О | О | О | ■ |          C |  ██  ██    | C
 
 BOARD_SIZE = 6
 SHIP_SET = [3, 2, 2, 1, 1, 1, 1]
+# no game printing and no pauses, for robot vs robot runs
+SILENT = False
 
 
 def main():
@@ -845,7 +1011,7 @@ def main():
     random.seed(datetime.now().timestamp())
 
     cls()
-    game = Game(BOARD_SIZE, SHIP_SET)
+    game = Game(BOARD_SIZE, SHIP_SET, quiet=SILENT)
     if game.setup():
         input("\nPress Enter key to start")
         cls()